@@ -1,7 +1,7 @@
-from base64 import b64encode
+from base64 import b64decode, b64encode
 from dataclasses import dataclass
 from functools import singledispatch
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
 from mutagen import (
     FileType,
@@ -17,6 +17,7 @@ from mutagen import (
 )
 
 JPEG_MIME_TYPE: str = "image/jpeg"
+PNG_MIME_TYPE: str = "image/png"
 
 
 @dataclass(frozen=True)
@@ -26,7 +27,8 @@ class MetadataInfo:
     description: Optional[str]
     genre: Optional[str]
 
-    artwork_jpeg: Optional[bytes]
+    artwork: Optional[bytes]
+    artwork_mime_type: str
 
     link: Optional[str]
     date: Optional[str]
@@ -42,24 +44,30 @@ def assemble_metadata(file: FileType, meta: MetadataInfo) -> None:  # noqa: ARG0
     raise NotImplementedError
 
 
-def _get_flac_pic(jpeg_data: bytes) -> flac.Picture:
+def _get_flac_pic(data: bytes, mime_type: str) -> flac.Picture:
     pic = flac.Picture()
-    pic.data = jpeg_data
-    pic.mime = JPEG_MIME_TYPE
+    pic.data = data
+    pic.mime = mime_type
     pic.type = id3.PictureType.COVER_FRONT
     return pic
 
 
-def _get_apic(jpeg_data: bytes) -> id3.APIC:
+def _get_apic(data: bytes, mime_type: str) -> id3.APIC:
     return id3.APIC(
         encoding=3,
-        mime=JPEG_MIME_TYPE,
+        mime=mime_type,
         type=3,
         desc="Cover",
-        data=jpeg_data,
+        data=data,
     )
 
 
+def _get_mp4_cover(data: bytes, mime_type: str) -> mp4.MP4Cover:
+    if mime_type == PNG_MIME_TYPE:
+        return mp4.MP4Cover(data, imageformat=mp4.MP4Cover.FORMAT_PNG)
+    return mp4.MP4Cover(data, imageformat=mp4.MP4Cover.FORMAT_JPEG)
+
+
 def _assemble_vorbis_tags(file: FileType, meta: MetadataInfo) -> None:
     file["artist"] = meta.artist
     file["title"] = meta.title
@@ -93,8 +101,10 @@ def _assemble_vorbis_tags(file: FileType, meta: MetadataInfo) -> None:
 def _(file: flac.FLAC, meta: MetadataInfo) -> None:
     _assemble_vorbis_tags(file, meta)
 
-    if meta.artwork_jpeg:
-        file.add_picture(_get_flac_pic(meta.artwork_jpeg))
+    if meta.artwork:
+        # Pictures are not part of the tags, replace them explicitly
+        file.clear_pictures()
+        file.add_picture(_get_flac_pic(meta.artwork, meta.artwork_mime_type))
 
 
 @assemble_metadata.register(oggtheora.OggTheora)
@@ -103,8 +113,8 @@ def _(file: flac.FLAC, meta: MetadataInfo) -> None:
 def _(file: oggopus.OggOpus, meta: MetadataInfo) -> None:
     _assemble_vorbis_tags(file, meta)
 
-    if meta.artwork_jpeg:
-        pic = _get_flac_pic(meta.artwork_jpeg).write()
+    if meta.artwork:
+        pic = _get_flac_pic(meta.artwork, meta.artwork_mime_type).write()
         file["metadata_block_picture"] = b64encode(pic).decode()
 
 
@@ -136,8 +146,8 @@ def _(file: Union[wave.WAVE, mp3.MP3], meta: MetadataInfo) -> None:
     if meta.album_track_num is not None:
         file["TRCK"] = id3.TRCK(encoding=3, text=str(meta.album_track_num))
 
-    if meta.artwork_jpeg:
-        file["APIC"] = _get_apic(meta.artwork_jpeg)
+    if meta.artwork:
+        file["APIC"] = _get_apic(meta.artwork, meta.artwork_mime_type)
 
 
 @assemble_metadata.register(mp4.MP4)
@@ -167,5 +177,48 @@ def _(file: mp4.MP4, meta: MetadataInfo) -> None:
     if meta.description:
         file["\251cmt"] = meta.description
 
-    if meta.artwork_jpeg:
-        file["covr"] = [mp4.MP4Cover(meta.artwork_jpeg)]
+    if meta.artwork:
+        file["covr"] = [_get_mp4_cover(meta.artwork, meta.artwork_mime_type)]
+
+
+@singledispatch
+def extract_artwork(file: Optional[FileType]) -> Optional[Tuple[bytes, str]]:  # noqa: ARG001
+    """Returns the embedded artwork and its mime type, if any"""
+    return None
+
+
+@extract_artwork.register(flac.FLAC)
+def _(file: flac.FLAC) -> Optional[Tuple[bytes, str]]:
+    for pic in file.pictures:
+        return pic.data, pic.mime or JPEG_MIME_TYPE
+    return None
+
+
+@extract_artwork.register(oggtheora.OggTheora)
+@extract_artwork.register(oggspeex.OggSpeex)
+@extract_artwork.register(oggopus.OggOpus)
+def _(file: oggopus.OggOpus) -> Optional[Tuple[bytes, str]]:
+    for data in file.get("metadata_block_picture") or []:
+        pic = flac.Picture(b64decode(data))
+        return pic.data, pic.mime or JPEG_MIME_TYPE
+    return None
+
+
+@extract_artwork.register(aiff.AIFF)
+@extract_artwork.register(mp3.MP3)
+@extract_artwork.register(wave.WAVE)
+def _(file: Union[wave.WAVE, mp3.MP3]) -> Optional[Tuple[bytes, str]]:
+    if file.tags is None:
+        return None
+    for apic in file.tags.getall("APIC"):
+        return apic.data, apic.mime or JPEG_MIME_TYPE
+    return None
+
+
+@extract_artwork.register(mp4.MP4)
+def _(file: mp4.MP4) -> Optional[Tuple[bytes, str]]:
+    for cover in file.get("covr") or []:
+        if cover.imageformat == mp4.MP4Cover.FORMAT_PNG:
+            return bytes(cover), PNG_MIME_TYPE
+        return bytes(cover), JPEG_MIME_TYPE
+    return None
@@ -1,7 +1,7 @@
 """scdl allows you to download music from Soundcloud
 
 Usage:
-    scdl (-l <track_url> | me) [-a | -f | -C | -t | -p | -r][-c | --force-metadata]
+    scdl (-l <track_url> | me | --stdin-urls) [-a | -f | -C | -t | -p | -r][-c | --force-metadata]
     [-n <maxtracks>][-o <offset>][--hidewarnings][--debug | --error][--path <path>]
     [--addtofile][--addtimestamp][--onlymp3][--hide-progress][--min-size <size>]
     [--max-size <size>][--remove][--no-album-tag][--no-playlist-folder]
@@ -9,7 +9,7 @@ Usage:
     [--original-name][--original-metadata][--no-original][--only-original]
     [--name-format <format>][--strict-playlist][--playlist-name-format <format>]
     [--client-id <id>][--auth-token <token>][--overwrite][--no-playlist][--opus]
-    [--add-description]
+    [--add-description][--jobs <jobs>]
 
     scdl -h | --help
     scdl --version
@@ -19,6 +19,7 @@ Options:
     -h --help                       Show this screen
     --version                       Show version
     -l [url]                        URL can be track/playlist/user
+    --stdin-urls                    Read the URLs to download from stdin, one per line
     -n [maxtracks]                  Download the n last tracks of a playlist according to the
                                     creation date
     -a                              Download all tracks of user (including reposts)
@@ -71,6 +72,8 @@ Options:
     --no-playlist                   Skip downloading playlists
     --add-description               Adds the description to a separate txt file
     --opus                          Prefer downloading opus streams over mp3 streams
+    --jobs [jobs]                   Number of tracks to download at the same time when
+                                    downloading a playlist or the tracks of a user (default: 1)
 """
 
 import atexit
@@ -83,6 +86,7 @@ import math
 import mimetypes
 import os
 import pathlib
+import re
 import shutil
 import subprocess
 import sys
@@ -93,10 +97,26 @@ import traceback
 import typing
 import urllib.parse
 import warnings
-from dataclasses import asdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, fields, is_dataclass
 from functools import lru_cache
 from types import TracebackType
-from typing import IO, Generator, List, NoReturn, Optional, Set, Tuple, Type, Union
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Generator,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 from tqdm import tqdm
 
@@ -106,15 +126,16 @@ else:
     from typing import TypedDict
 
 if sys.version_info < (3, 11):
-    from typing_extensions import NotRequired
+    from typing_extensions import NotRequired, Self
 else:
-    from typing import NotRequired
+    from typing import NotRequired, Self
 
 import filelock
 import mutagen
 import requests
 from docopt import docopt
 from pathvalidate import sanitize_filename
+from requests.adapters import HTTPAdapter
 from soundcloud import (
     AlbumPlaylist,
     BasicAlbumPlaylist,
@@ -131,19 +152,42 @@ from soundcloud import (
     Transcoding,
     User,
 )
+from urllib3.util.retry import Retry
 
 from scdl import __version__, utils
-from scdl.metadata_assembler import MetadataInfo, assemble_metadata
-
-mimetypes.init()
+from scdl.metadata_assembler import (
+    JPEG_MIME_TYPE,
+    PNG_MIME_TYPE,
+    MetadataInfo,
+    assemble_metadata,
+    extract_artwork,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 logger.addFilter(utils.ColorizeFilter())
 
 FFMPEG_PIPE_CHUNK_SIZE = 1024 * 1024  # 1 mb
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 mb
+HLS_SEGMENT_JOBS = 8
+HLS_REQUEST_TIMEOUT = 30  # seconds
+API_JOBS = 4
+TRACKS_PER_REQUEST = 50
+
+# Lossless formats that can be converted to flac
+CONVERTIBLE_EXTENSIONS = frozenset((".wav", ".wave", ".aif", ".aiff", ".aifc"))
 
-files_to_keep = []
+# Separators between the artist and the title in track titles
+DASH_RE = re.compile(" [-−–—―] ")  # noqa: RUF001
+HLS_MAP_URI_RE = re.compile(r'URI="([^"]+)"')
+
+files_to_keep: Set[str] = set()
+files_to_keep_lock = threading.Lock()
+
+# Track ids waiting to be written to each download archive
+DOWNLOAD_ARCHIVE_FLUSH_INTERVAL = 10
+pending_download_archive_lines: Dict[str, List[str]] = {}
+download_archive_lock = threading.Lock()
 
 
 class SCDLArgs(TypedDict):
@@ -157,6 +201,7 @@ class SCDLArgs(TypedDict):
     client_id: Optional[str]
     debug: bool
     download_archive: Optional[str]
+    download_archive_ids: NotRequired[Set[str]]
     error: bool
     extract_artist: bool
     f: bool
@@ -164,6 +209,7 @@ class SCDLArgs(TypedDict):
     force_metadata: bool
     hide_progress: bool
     hidewarnings: bool
+    jobs: int
     l: str  # noqa: E741
     max_size: Optional[int]
     me: bool
@@ -184,12 +230,13 @@ class SCDLArgs(TypedDict):
     original_name: bool
     overwrite: bool
     p: bool
-    path: Optional[str]
+    path: str
     playlist_name_format: str
     playlist_offset: NotRequired[int]
     r: bool
     remove: bool
     strict_playlist: bool
+    stdin_urls: bool
     sync: Optional[str]
     t: bool
 
@@ -268,6 +315,84 @@ def get_filelock(path: Union[pathlib.Path, str], timeout: int = 10) -> filelock.
     return filelock.FileLock(lock_path, timeout=timeout)
 
 
+def get_output_lock(filename: str, to_stdout: bool) -> ContextManager[object]:
+    """Returns a lock to hold from checking whether a file exists until it is written,
+    so that tracks whose names format to the same file are not written at the same time
+    """
+    if to_stdout:
+        return contextlib.nullcontext()
+    return get_filelock(filename, -1)
+
+
+class DownloadPool:
+    """Runs downloads on at most `jobs` worker threads.
+
+    With a single job, downloads are run directly in the calling thread.
+    Errors raised by a download (including `sys.exit`) are re-raised in
+    the calling thread as soon as they are noticed.
+    """
+
+    def __init__(self, jobs: int):
+        self._executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        self._slots = threading.BoundedSemaphore(jobs)
+        self._futures: List[Future] = []
+
+    def submit(self, fn: Callable[..., None], *args: object, **kwargs: object) -> None:
+        if self._executor is None:
+            fn(*args, **kwargs)
+            return
+        # Only queue as many downloads as there are workers, so that
+        # paginated resources are fetched lazily
+        self._slots.acquire()
+        self._reap()
+        future = self._executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def wait(self) -> None:
+        """Waits for all submitted downloads to finish"""
+        for future in self._futures:
+            future.result()
+        self._futures.clear()
+
+    def _reap(self) -> None:
+        pending = []
+        for future in self._futures:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._futures = pending
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        try:
+            if exc_info[0] is None:
+                self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+
+@lru_cache(maxsize=1)
+def get_requests_session() -> requests.Session:
+    """Returns the session used for all requests, so that connections are reused"""
+    session = requests.Session()
+    # 429 is handled by get_transcoding_m3u8 with its own backoff
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def main() -> None:
     """Main function, parses the URL from command line arguments"""
     logger.addHandler(logging.StreamHandler())
@@ -275,6 +400,42 @@ def main() -> None:
     # Parse arguments
     arguments = docopt(__doc__, version=__version__)
 
+    client, kwargs = setup(arguments)
+
+    failed = False
+    if kwargs["stdin_urls"]:
+        # Reuse the same client and connections for every URL. A URL that fails
+        # does not prevent the next ones from being downloaded
+        for line in sys.stdin:
+            url = line.strip()
+            if not url:
+                continue
+            try:
+                run(client, url, kwargs)
+            except SystemExit as err:
+                if err.code:
+                    logger.error(f"Could not download {url}")
+                    failed = True
+            except Exception:
+                logger.exception(f"Could not download {url}")
+                failed = True
+    else:
+        run(client, kwargs["l"], kwargs)
+
+    if failed:
+        # Files of the URLs that failed are not known, so they would all be removed
+        if kwargs["remove"]:
+            logger.error("Not removing files because some URLs could not be downloaded")
+        sys.exit(1)
+
+    if kwargs["remove"]:
+        remove_files(pathlib.Path(kwargs["path"]))
+
+
+def setup(arguments: Dict[str, Any]) -> Tuple[SoundCloud, SCDLArgs]:
+    """Loads the config, creates the client and converts the command line arguments
+    to kwargs for the download functions
+    """
     if arguments["--debug"]:
         logger.level = logging.DEBUG
     elif arguments["--error"]:
@@ -351,6 +512,18 @@ def main() -> None:
             sys.exit(1)
         logger.debug("max-size: %d", arguments["--max-size"])
 
+    if arguments["--jobs"] is not None:
+        try:
+            arguments["--jobs"] = int(arguments["--jobs"])
+            if arguments["--jobs"] < 1:
+                raise ValueError
+        except Exception:
+            logger.error("Jobs should be a positive integer...")
+            sys.exit(1)
+        logger.debug("jobs: %d", arguments["--jobs"])
+    else:
+        arguments["--jobs"] = 1
+
     if arguments["--hidewarnings"]:
         warnings.filterwarnings("ignore")
 
@@ -366,8 +539,6 @@ def main() -> None:
         assert me is not None
         arguments["-l"] = me.permalink_url
 
-    arguments["-l"] = validate_url(client, arguments["-l"])
-
     if arguments["--download-archive"]:
         try:
             path = pathlib.Path(arguments["--download-archive"]).resolve()
@@ -391,22 +562,31 @@ def main() -> None:
         key = key.strip("-").replace("-", "_")
         python_args[key] = value
 
-    # change download path
+    if python_args["download_archive"]:
+        python_args["download_archive_ids"] = load_download_archive(
+            python_args["download_archive"],
+        )
+
+    # check download path
     dl_path: str = arguments["--path"] or config["scdl"]["path"]
-    if os.path.exists(dl_path):
-        os.chdir(dl_path)
-    else:
+    if not os.path.exists(dl_path):
         if arguments["--path"]:
             logger.error(f"Invalid download path '{dl_path}' specified by --path argument")
         else:
             logger.error(f"Invalid download path '{dl_path}' in {config_file}")
         sys.exit(1)
-    logger.debug("Downloading to " + os.getcwd() + "...")
+    python_args["path"] = dl_path
+    logger.debug("Downloading to " + os.path.abspath(dl_path) + "...")
 
-    download_url(client, typing.cast(SCDLArgs, python_args))
+    return client, typing.cast(SCDLArgs, python_args)
 
-    if arguments["--remove"]:
-        remove_files()
+
+def run(client: SoundCloud, url: str, kwargs: SCDLArgs) -> None:
+    """Downloads a single URL"""
+    # download_url stores per URL state in kwargs
+    url_kwargs = kwargs.copy()
+    url_kwargs["l"] = validate_url(client, url)
+    download_url(client, pathlib.Path(kwargs["path"]), url_kwargs)
 
 
 def validate_url(client: SoundCloud, url: str) -> str:
@@ -427,7 +607,7 @@ def validate_url(client: SoundCloud, url: str) -> str:
 
     # see if link redirects to soundcloud.com
     try:
-        resp = requests.get(url)
+        resp = get_requests_session().get(url)
         if url.startswith(("https://soundcloud.com", "http://soundcloud.com")):
             return urllib.parse.urljoin(resp.url, urllib.parse.urlparse(resp.url).path)
     except Exception:
@@ -451,14 +631,19 @@ def get_config(config_file: pathlib.Path) -> configparser.ConfigParser:
             config.read_file(f)
 
         # load config file if it exists
+        old_config = ""
         if config_file.exists():
             with open(config_file, encoding="UTF-8") as f:
-                config.read_file(f)
+                old_config = f.read()
+            config.read_string(old_config, str(config_file))
 
-        # save config to disk
-        config_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_file, "w", encoding="UTF-8") as f:
-            config.write(f)
+        # save config to disk, only if it changed
+        new_config = io.StringIO()
+        config.write(new_config)
+        if new_config.getvalue() != old_config:
+            config_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(config_file, "w", encoding="UTF-8") as f:
+                f.write(new_config.getvalue())
 
     return config
 
@@ -467,8 +652,10 @@ def truncate_str(s: str, length: int) -> str:
     """Truncate string to a certain number of bytes using the file system encoding"""
     encoding = sys.getfilesystemencoding()
     bytes = s.encode(encoding)
-    bytes = bytes[:length]
-    return bytes.decode(encoding, errors="ignore")
+    if len(bytes) <= length:
+        return s
+    # Slicing may split a multibyte character, which is dropped when decoding
+    return bytes[:length].decode(encoding, errors="ignore")
 
 
 def sanitize_str(
@@ -478,6 +665,8 @@ def sanitize_str(
     max_length: int = 255,
 ) -> str:
     """Sanitizes a string for use as a filename. Does not allow the file to be hidden"""
+    # Drop lone surrogates, which cannot be encoded and cannot be part of a file name
+    filename = filename.encode("utf-8", "surrogatepass").decode("utf-8", "ignore")
     if filename.startswith("."):
         filename = "_" + filename
     if filename.endswith(".") and not ext:
@@ -493,7 +682,7 @@ def sanitize_str(
     return sanitized + ext
 
 
-def download_url(client: SoundCloud, kwargs: SCDLArgs) -> None:
+def download_url(client: SoundCloud, dest_dir: pathlib.Path, kwargs: SCDLArgs) -> None:
     """Detects if a URL is a track or a playlist, and parses the track(s)
     to the track downloader
     """
@@ -506,131 +695,174 @@ def download_url(client: SoundCloud, kwargs: SCDLArgs) -> None:
         sys.exit(1)
     elif isinstance(item, Track):
         logger.info("Found a track")
-        download_track(client, item, kwargs)
+        download_track(client, item, dest_dir, kwargs)
     elif isinstance(item, AlbumPlaylist):
         logger.info("Found a playlist")
         kwargs["playlist_offset"] = offset
-        download_playlist(client, item, kwargs)
+        download_playlist(client, item, dest_dir, kwargs)
     elif isinstance(item, User):
-        user = item
         logger.info("Found a user profile")
-        if kwargs.get("f"):
-            logger.info(f"Retrieving all likes of user {user.username}...")
-            likes = client.get_user_likes(user.id, limit=1000)
-            for i, like in itertools.islice(enumerate(likes, 1), offset, None):
-                logger.info(f"like n°{i} of {user.likes_count}")
-                if isinstance(like, TrackLike):
-                    download_track(
-                        client,
-                        like.track,
-                        kwargs,
-                        exit_on_fail=kwargs["strict_playlist"],
-                    )
-                elif isinstance(like, PlaylistLike):
-                    playlist = client.get_playlist(like.playlist.id)
-                    assert playlist is not None
-                    download_playlist(client, playlist, kwargs)
-                else:
-                    logger.error(f"Unknown like type {like}")
-                    if kwargs.get("strict_playlist"):
-                        sys.exit(1)
-            logger.info(f"Downloaded all likes of user {user.username}!")
-        elif kwargs.get("C"):
-            logger.info(f"Retrieving all commented tracks of user {user.username}...")
-            comments = client.get_user_comments(user.id, limit=1000)
-            for i, comment in itertools.islice(enumerate(comments, 1), offset, None):
-                logger.info(f"comment n°{i} of {user.comments_count}")
-                track = client.get_track(comment.track.id)
-                assert track is not None
-                download_track(
+        # Tracks are downloaded concurrently, but playlists are downloaded one at a
+        # time so that they do not compete with the user's tracks for workers
+        jobs = 1 if is_downloading_to_stdout(kwargs) else kwargs.get("jobs", 1)
+        with DownloadPool(jobs) as pool:
+            download_user(client, item, dest_dir, kwargs, pool)
+    else:
+        logger.error(f"Unknown item type {item.kind}")
+        sys.exit(1)
+
+
+def download_user(
+    client: SoundCloud,
+    user: User,
+    dest_dir: pathlib.Path,
+    kwargs: SCDLArgs,
+    pool: DownloadPool,
+) -> None:
+    """Downloads the tracks and/or playlists of a user, depending on the download type"""
+    offset = kwargs.get("offset", 0)
+    if kwargs.get("f"):
+        logger.info(f"Retrieving all likes of user {user.username}...")
+        likes = client.get_user_likes(user.id, limit=1000)
+        for i, like in itertools.islice(enumerate(likes, 1), offset, None):
+            logger.info(f"like n°{i} of {user.likes_count}")
+            if isinstance(like, TrackLike):
+                pool.submit(
+                    download_track,
+                    client,
+                    like.track,
+                    dest_dir,
+                    kwargs,
+                    exit_on_fail=kwargs["strict_playlist"],
+                )
+            elif isinstance(like, PlaylistLike):
+                pool.wait()
+                playlist = client.get_playlist(like.playlist.id)
+                assert playlist is not None
+                download_playlist(client, playlist, dest_dir, kwargs)
+            else:
+                logger.error(f"Unknown like type {like}")
+                if kwargs.get("strict_playlist"):
+                    sys.exit(1)
+        pool.wait()
+        logger.info(f"Downloaded all likes of user {user.username}!")
+    elif kwargs.get("C"):
+        logger.info(f"Retrieving all commented tracks of user {user.username}...")
+        comments = client.get_user_comments(user.id, limit=1000)
+        for i, comment in itertools.islice(enumerate(comments, 1), offset, None):
+            logger.info(f"comment n°{i} of {user.comments_count}")
+            pool.submit(download_track_by_id, client, comment.track.id, dest_dir, kwargs)
+        pool.wait()
+        logger.info(f"Downloaded all commented tracks of user {user.username}!")
+    elif kwargs.get("t"):
+        logger.info(f"Retrieving all tracks of user {user.username}...")
+        tracks = client.get_user_tracks(user.id, limit=1000)
+        for i, track in itertools.islice(enumerate(tracks, 1), offset, None):
+            logger.info(f"track n°{i} of {user.track_count}")
+            pool.submit(
+                download_track,
+                client,
+                track,
+                dest_dir,
+                kwargs,
+                exit_on_fail=kwargs["strict_playlist"],
+            )
+        pool.wait()
+        logger.info(f"Downloaded all tracks of user {user.username}!")
+    elif kwargs.get("a"):
+        logger.info(f"Retrieving all tracks & reposts of user {user.username}...")
+        items = client.get_user_stream(user.id, limit=1000)
+        for i, stream_item in itertools.islice(enumerate(items, 1), offset, None):
+            logger.info(
+                f"item n°{i} of "
+                f"{user.track_count + user.reposts_count if user.reposts_count else '?'}",
+            )
+            if isinstance(stream_item, (TrackStreamItem, TrackStreamRepostItem)):
+                pool.submit(
+                    download_track,
                     client,
-                    track,
+                    stream_item.track,
+                    dest_dir,
                     kwargs,
                     exit_on_fail=kwargs["strict_playlist"],
                 )
-            logger.info(f"Downloaded all commented tracks of user {user.username}!")
-        elif kwargs.get("t"):
-            logger.info(f"Retrieving all tracks of user {user.username}...")
-            tracks = client.get_user_tracks(user.id, limit=1000)
-            for i, track in itertools.islice(enumerate(tracks, 1), offset, None):
-                logger.info(f"track n°{i} of {user.track_count}")
-                download_track(client, track, kwargs, exit_on_fail=kwargs["strict_playlist"])
-            logger.info(f"Downloaded all tracks of user {user.username}!")
-        elif kwargs.get("a"):
-            logger.info(f"Retrieving all tracks & reposts of user {user.username}...")
-            items = client.get_user_stream(user.id, limit=1000)
-            for i, stream_item in itertools.islice(enumerate(items, 1), offset, None):
-                logger.info(
-                    f"item n°{i} of "
-                    f"{user.track_count + user.reposts_count if user.reposts_count else '?'}",
+            elif isinstance(stream_item, (PlaylistStreamItem, PlaylistStreamRepostItem)):
+                pool.wait()
+                download_playlist(client, stream_item.playlist, dest_dir, kwargs)
+            else:
+                logger.error(f"Unknown item type {stream_item.type}")
+                if kwargs.get("strict_playlist"):
+                    sys.exit(1)
+        pool.wait()
+        logger.info(f"Downloaded all tracks & reposts of user {user.username}!")
+    elif kwargs.get("p"):
+        logger.info(f"Retrieving all playlists of user {user.username}...")
+        playlists = client.get_user_playlists(user.id, limit=1000)
+        for i, playlist in itertools.islice(enumerate(playlists, 1), offset, None):
+            logger.info(f"playlist n°{i} of {user.playlist_count}")
+            download_playlist(client, playlist, dest_dir, kwargs)
+        logger.info(f"Downloaded all playlists of user {user.username}!")
+    elif kwargs.get("r"):
+        logger.info(f"Retrieving all reposts of user {user.username}...")
+        reposts = client.get_user_reposts(user.id, limit=1000)
+        for i, repost in itertools.islice(enumerate(reposts, 1), offset, None):
+            logger.info(f"item n°{i} of {user.reposts_count or '?'}")
+            if isinstance(repost, TrackStreamRepostItem):
+                pool.submit(
+                    download_track,
+                    client,
+                    repost.track,
+                    dest_dir,
+                    kwargs,
+                    exit_on_fail=kwargs["strict_playlist"],
                 )
-                if isinstance(stream_item, (TrackStreamItem, TrackStreamRepostItem)):
-                    download_track(
-                        client,
-                        stream_item.track,
-                        kwargs,
-                        exit_on_fail=kwargs["strict_playlist"],
-                    )
-                elif isinstance(stream_item, (PlaylistStreamItem, PlaylistStreamRepostItem)):
-                    download_playlist(client, stream_item.playlist, kwargs)
-                else:
-                    logger.error(f"Unknown item type {stream_item.type}")
-                    if kwargs.get("strict_playlist"):
-                        sys.exit(1)
-            logger.info(f"Downloaded all tracks & reposts of user {user.username}!")
-        elif kwargs.get("p"):
-            logger.info(f"Retrieving all playlists of user {user.username}...")
-            playlists = client.get_user_playlists(user.id, limit=1000)
-            for i, playlist in itertools.islice(enumerate(playlists, 1), offset, None):
-                logger.info(f"playlist n°{i} of {user.playlist_count}")
-                download_playlist(client, playlist, kwargs)
-            logger.info(f"Downloaded all playlists of user {user.username}!")
-        elif kwargs.get("r"):
-            logger.info(f"Retrieving all reposts of user {user.username}...")
-            reposts = client.get_user_reposts(user.id, limit=1000)
-            for i, repost in itertools.islice(enumerate(reposts, 1), offset, None):
-                logger.info(f"item n°{i} of {user.reposts_count or '?'}")
-                if isinstance(repost, TrackStreamRepostItem):
-                    download_track(
-                        client,
-                        repost.track,
-                        kwargs,
-                        exit_on_fail=kwargs["strict_playlist"],
-                    )
-                elif isinstance(repost, PlaylistStreamRepostItem):
-                    download_playlist(client, repost.playlist, kwargs)
-                else:
-                    logger.error(f"Unknown item type {repost.type}")
-                    if kwargs.get("strict_playlist"):
-                        sys.exit(1)
-            logger.info(f"Downloaded all reposts of user {user.username}!")
-        else:
-            logger.error("Please provide a download type...")
-            sys.exit(1)
+            elif isinstance(repost, PlaylistStreamRepostItem):
+                pool.wait()
+                download_playlist(client, repost.playlist, dest_dir, kwargs)
+            else:
+                logger.error(f"Unknown item type {repost.type}")
+                if kwargs.get("strict_playlist"):
+                    sys.exit(1)
+        pool.wait()
+        logger.info(f"Downloaded all reposts of user {user.username}!")
     else:
-        logger.error(f"Unknown item type {item.kind}")
+        logger.error("Please provide a download type...")
         sys.exit(1)
 
 
-def remove_files() -> None:
+def download_track_by_id(
+    client: SoundCloud,
+    track_id: int,
+    dest_dir: pathlib.Path,
+    kwargs: SCDLArgs,
+) -> None:
+    """Fetches a track and downloads it"""
+    track = client.get_track(track_id)
+    assert track is not None
+    download_track(client, track, dest_dir, kwargs, exit_on_fail=kwargs["strict_playlist"])
+
+
+def remove_files(dest_dir: pathlib.Path) -> None:
     """Removes any pre-existing tracks that were not just downloaded"""
     logger.info("Removing local track files that were not downloaded...")
-    files = [f for f in os.listdir(".") if os.path.isfile(f)]
-    for f in files:
-        if f not in files_to_keep:
-            os.remove(f)
+    with os.scandir(dest_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and str(dest_dir / entry.name) not in files_to_keep:
+                os.remove(entry.path)
 
 
 def sync(
     client: SoundCloud,
     playlist: Union[AlbumPlaylist, BasicAlbumPlaylist],
     playlist_info: PlaylistInfo,
+    dest_dir: pathlib.Path,
     kwargs: SCDLArgs,
 ) -> Tuple[Union[BasicTrack, MiniTrack], ...]:
     """Downloads/Removes tracks that have been changed on playlist since last archive file"""
     logger.info("Comparing tracks...")
     archive = kwargs.get("sync")
     assert archive is not None
+    flush_download_archive(archive)
     with get_filelock(archive):
         with open(archive) as f:
             try:
@@ -666,9 +898,9 @@ def sync(
                         ext,
                         playlist_info=playlist_info,
                     )
-                    if filename in os.listdir("."):
+                    if filename in os.listdir(dest_dir):
                         removed = True
-                        os.remove(filename)
+                        os.remove(dest_dir / filename)
                         logger.info(f"Removed {filename}")
                 if not removed:
                     logger.info(f"Could not find {filename} to remove")
@@ -676,6 +908,9 @@ def sync(
                 for track_id in old:
                     if track_id not in rem:
                         f.write(str(track_id) + "\n")
+            archive_ids = kwargs.get("download_archive_ids")
+            if archive_ids is not None:
+                archive_ids.difference_update(str(track_id) for track_id in rem)
         else:
             logger.info("No tracks to remove.")
 
@@ -688,14 +923,14 @@ def sync(
 def download_playlist(
     client: SoundCloud,
     playlist: Union[AlbumPlaylist, BasicAlbumPlaylist],
+    dest_dir: pathlib.Path,
     kwargs: SCDLArgs,
 ) -> None:
     """Downloads a playlist"""
     if kwargs.get("no_playlist"):
         logger.info("Skipping playlist...")
         return
-    playlist_name = playlist.title.encode("utf-8", "ignore").decode("utf-8")
-    playlist_name = sanitize_str(playlist_name)
+    playlist_name = sanitize_str(playlist.title)
     playlist_info: PlaylistInfo = {
         "author": playlist.user.username,
         "id": playlist.id,
@@ -706,51 +941,101 @@ def download_playlist(
     }
 
     if not kwargs.get("no_playlist_folder"):
-        if not os.path.exists(playlist_name):
-            os.makedirs(playlist_name)
-        os.chdir(playlist_name)
+        dest_dir = dest_dir / playlist_name
+        dest_dir.mkdir(parents=True, exist_ok=True)
 
-    try:
-        n = kwargs.get("n")
-        if n is not None:  # Order by creation date and get the n lasts tracks
-            playlist.tracks = tuple(
-                sorted(playlist.tracks, key=lambda track: track.id, reverse=True)[: int(n)],
-            )
-            kwargs["playlist_offset"] = 0
-        s = kwargs.get("sync")
-        if s:
-            if os.path.isfile(s):
-                playlist.tracks = sync(client, playlist, playlist_info, kwargs)
-            else:
-                logger.error(f'Invalid sync archive file {kwargs.get("sync")}')
-                sys.exit(1)
+    n = kwargs.get("n")
+    if n is not None:  # Order by creation date and get the n lasts tracks
+        playlist.tracks = tuple(
+            sorted(playlist.tracks, key=lambda track: track.id, reverse=True)[: int(n)],
+        )
+        kwargs["playlist_offset"] = 0
+    s = kwargs.get("sync")
+    if s:
+        if os.path.isfile(s):
+            playlist.tracks = sync(client, playlist, playlist_info, dest_dir, kwargs)
+        else:
+            logger.error(f'Invalid sync archive file {kwargs.get("sync")}')
+            sys.exit(1)
 
-        tracknumber_digits = len(str(len(playlist.tracks)))
+    tracknumber_digits = len(str(len(playlist.tracks)))
+    playlist_offset = kwargs.get("playlist_offset", 0)
+    full_tracks = get_playlist_full_tracks(client, playlist, playlist.tracks[playlist_offset:])
+    jobs = 1 if is_downloading_to_stdout(kwargs) else kwargs.get("jobs", 1)
+    with DownloadPool(jobs) as pool:
         for counter, track in itertools.islice(
             enumerate(playlist.tracks, 1),
-            kwargs.get("playlist_offset", 0),
+            playlist_offset,
             None,
         ):
-            logger.debug(track)
-            logger.info(f"Track n°{counter}")
-            playlist_info["tracknumber_int"] = counter
-            playlist_info["tracknumber"] = str(counter).zfill(tracknumber_digits)
-            if isinstance(track, MiniTrack):
-                if playlist.secret_token:
-                    track = client.get_tracks([track.id], playlist.id, playlist.secret_token)[0]
-                else:
-                    track = client.get_track(track.id)  # type: ignore[assignment]
-            assert isinstance(track, BasicTrack)
-            download_track(
+            track = full_tracks.get(track.id, track)
+            # Each track gets its own copy since tracks may be downloaded concurrently
+            track_playlist_info = playlist_info.copy()
+            track_playlist_info["tracknumber_int"] = counter
+            track_playlist_info["tracknumber"] = str(counter).zfill(tracknumber_digits)
+            pool.submit(
+                download_playlist_track,
                 client,
+                playlist,
                 track,
+                track_playlist_info,
+                dest_dir,
                 kwargs,
-                playlist_info,
-                kwargs["strict_playlist"],
             )
-    finally:
-        if not kwargs.get("no_playlist_folder"):
-            os.chdir("..")
+
+
+def get_playlist_full_tracks(
+    client: SoundCloud,
+    playlist: Union[AlbumPlaylist, BasicAlbumPlaylist],
+    tracks: Sequence[Union[BasicTrack, MiniTrack]],
+) -> Dict[int, BasicTrack]:
+    """Fetches the full tracks of the mini tracks of a playlist, with one request
+    per TRACKS_PER_REQUEST tracks
+    """
+    mini_track_ids = [track.id for track in tracks if isinstance(track, MiniTrack)]
+    batches = [
+        mini_track_ids[i : i + TRACKS_PER_REQUEST]
+        for i in range(0, len(mini_track_ids), TRACKS_PER_REQUEST)
+    ]
+    if not batches:
+        return {}
+
+    def get_tracks(track_ids: List[int]) -> List[BasicTrack]:
+        return client.get_tracks(track_ids, playlist.id, playlist.secret_token)
+
+    full_tracks: Dict[int, BasicTrack] = {}
+    with ThreadPoolExecutor(max_workers=API_JOBS) as executor:
+        for batch in executor.map(get_tracks, batches):
+            full_tracks.update((track.id, track) for track in batch)
+    return full_tracks
+
+
+def download_playlist_track(
+    client: SoundCloud,
+    playlist: Union[AlbumPlaylist, BasicAlbumPlaylist],
+    track: Union[BasicTrack, MiniTrack],
+    playlist_info: PlaylistInfo,
+    dest_dir: pathlib.Path,
+    kwargs: SCDLArgs,
+) -> None:
+    """Downloads a track of a playlist"""
+    logger.debug(track)
+    logger.info(f"Track n°{playlist_info['tracknumber_int']}")
+    # Mini tracks are usually fetched beforehand by get_playlist_full_tracks
+    if isinstance(track, MiniTrack):
+        if playlist.secret_token:
+            track = client.get_tracks([track.id], playlist.id, playlist.secret_token)[0]
+        else:
+            track = client.get_track(track.id)  # type: ignore[assignment]
+    assert isinstance(track, BasicTrack)
+    download_track(
+        client,
+        track,
+        dest_dir,
+        kwargs,
+        playlist_info,
+        kwargs["strict_playlist"],
+    )
 
 
 def try_utime(path: str, filetime: float) -> None:
@@ -777,6 +1062,35 @@ def get_stdout() -> Generator[IO, None, None]:
     yield getattr(sys.stdout, "buffer", sys.stdout)
 
 
+def _to_format_value(value: object) -> object:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_format_value(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _to_format_value(v) for k, v in value.items()}
+    return value
+
+
+class TrackFormatFields(Dict[str, object]):
+    """Fields available to name formats.
+
+    Track fields are converted like `dataclasses.asdict` would, but only
+    when a format uses them.
+    """
+
+    def __init__(self, track: Union[BasicTrack, Track], **extra_fields: object):
+        super().__init__(**extra_fields)
+        self._track = track
+
+    def __missing__(self, key: str) -> object:
+        if key not in {field.name for field in fields(self._track)}:
+            raise KeyError(key)
+        value = _to_format_value(getattr(self._track, key))
+        self[key] = value
+        return value
+
+
 def get_filename(
     track: Union[BasicTrack, Track],
     kwargs: SCDLArgs,
@@ -789,7 +1103,7 @@ def get_filename(
         return "stdout"
 
     username = track.user.username
-    title = track.title.encode("utf-8", "ignore").decode("utf-8")
+    title = track.title
 
     if kwargs.get("addtofile") and username not in title and "-" not in title:
         title = f"{username} - {title}"
@@ -801,16 +1115,15 @@ def get_filename(
 
     if not kwargs.get("addtofile") and not kwargs.get("addtimestamp"):
         if playlist_info:
-            title = kwargs["playlist_name_format"].format(
-                **asdict(track),
-                playlist=playlist_info,
-                timestamp=timestamp,
+            title = kwargs["playlist_name_format"].format_map(
+                TrackFormatFields(track, playlist=playlist_info, timestamp=timestamp),
             )
         else:
-            title = kwargs["name_format"].format(**asdict(track), timestamp=timestamp)
+            title = kwargs["name_format"].format_map(
+                TrackFormatFields(track, timestamp=timestamp),
+            )
 
     if original_filename is not None:
-        original_filename = original_filename.encode("utf-8", "ignore").decode("utf-8")
         ext = os.path.splitext(original_filename)[1]
     return sanitize_str(title, ext or "")
 
@@ -819,12 +1132,29 @@ def download_original_file(
     client: SoundCloud,
     track: Union[BasicTrack, Track],
     title: str,
+    dest_dir: pathlib.Path,
     kwargs: SCDLArgs,
     playlist_info: Optional[PlaylistInfo] = None,
 ) -> Tuple[Optional[str], bool]:
     logger.info("Downloading the original file.")
     to_stdout = is_downloading_to_stdout(kwargs)
 
+    # The file name depends on the response, but archived tracks can be skipped
+    # before making any request, unless the actual file is needed
+    if (
+        not to_stdout
+        and not kwargs.get("overwrite")
+        and not kwargs.get("force_metadata")
+        and not kwargs.get("remove")
+        and not kwargs.get("add_description")
+        and not kwargs.get("flac")
+        and in_download_archive(track, kwargs)
+    ):
+        logger.debug("Track is in the download archive, not requesting the original file")
+        # Without the response the extension is unknown, so this name is approximate
+        filename = str(dest_dir / get_filename(track, kwargs, playlist_info=playlist_info))
+        return filename, already_downloaded(track, title, filename, kwargs)
+
     # Get the requests stream
     url = client.get_track_original_download(track.id, track.secret_token)
 
@@ -832,7 +1162,7 @@ def download_original_file(
         logger.info("Could not get original download link")
         return None, False
 
-    r = requests.get(url, stream=True)
+    r = get_requests_session().get(url, stream=True)
     if r.status_code == 401:
         logger.info("The original file has no download left.")
         return None, False
@@ -874,23 +1204,26 @@ def download_original_file(
     encoding_to_flac = bool(kwargs.get("flac")) and can_convert(orig_filename)
 
     if encoding_to_flac:
-        filename = filename[:-4] + ".flac"
+        filename = os.path.splitext(filename)[0] + ".flac"
 
-    # Skip if file ID or filename already exists
-    # We are always re-downloading to stdout
-    if not to_stdout and already_downloaded(track, title, filename, kwargs):
-        return filename, True
+    filename = str(dest_dir / filename)
 
-    re_encode_to_out(
-        track,
-        r,
-        ext[1:] if not encoding_to_flac else "flac",
-        not encoding_to_flac,  # copy the stream only if we aren't re-encoding to flac
-        filename,
-        kwargs,
-        playlist_info=playlist_info,
-        skip_re_encoding=not encoding_to_flac,
-    )
+    with get_output_lock(filename, to_stdout):
+        # Skip if file ID or filename already exists
+        # We are always re-downloading to stdout
+        if not to_stdout and already_downloaded(track, title, filename, kwargs):
+            return filename, True
+
+        re_encode_to_out(
+            track,
+            r,
+            ext[1:] if not encoding_to_flac else "flac",
+            not encoding_to_flac,  # copy the stream only if we aren't re-encoding to flac
+            filename,
+            kwargs,
+            playlist_info=playlist_info,
+            skip_re_encoding=not encoding_to_flac,
+        )
 
     return filename, False
 
@@ -928,7 +1261,12 @@ def get_transcoding_m3u8(
                 logger.warning(f"Got rate-limited, delaying for {delay}sec")
                 time.sleep(delay)
 
-            r = requests.get(url, headers=headers, params=params)
+            r = get_requests_session().get(
+                url,
+                headers=headers,
+                params=params,
+                timeout=HLS_REQUEST_TIMEOUT,
+            )
             delay = (delay or 1) * 2  # exponential backoff, what could possibly go wrong
 
         if r.status_code != 200:
@@ -939,10 +1277,68 @@ def get_transcoding_m3u8(
     raise SoundCloudException(f"Transcoding does not contain URL: {transcoding}")
 
 
+@lru_cache(maxsize=1)
+def get_hls_segment_executor() -> ThreadPoolExecutor:
+    """Returns the executor shared by all HLS downloads, so that tracks downloaded
+    at the same time do not use more connections than the session keeps
+    """
+    return ThreadPoolExecutor(max_workers=HLS_SEGMENT_JOBS)
+
+
+def _get_hls_segment(url: str) -> bytes:
+    r = get_requests_session().get(url, timeout=HLS_REQUEST_TIMEOUT)
+    if r.status_code != 200:
+        raise SoundCloudException(f"Unable to get HLS segment ({r.status_code}): {url}")
+    return r.content
+
+
+def download_hls_segments(url: str, kwargs: SCDLArgs) -> Optional[io.BytesIO]:
+    """Downloads all the segments of an HLS playlist concurrently and joins them.
+    Returns None if the playlist is not supported (e.g. it is encrypted),
+    in which case ffmpeg should read the playlist itself
+    """
+    r = get_requests_session().get(url, timeout=HLS_REQUEST_TIMEOUT)
+    if r.status_code != 200:
+        raise SoundCloudException(f"Unable to get HLS playlist ({r.status_code}): {r.text}")
+
+    segment_urls = []
+    for line in r.text.splitlines():
+        line = line.strip()
+        if (line.startswith("#EXT-X-KEY") and "METHOD=NONE" not in line) or line.startswith(
+            "#EXT-X-BYTERANGE",
+        ):
+            logger.debug("Unsupported HLS playlist, letting ffmpeg download it")
+            return None
+        if line.startswith("#EXT-X-MAP"):
+            # Initialization section of fragmented mp4 streams
+            match = HLS_MAP_URI_RE.search(line)
+            if match is None or "BYTERANGE" in line:
+                return None
+            segment_urls.append(urllib.parse.urljoin(r.url, match.group(1)))
+        elif line and not line.startswith("#"):
+            segment_urls.append(urllib.parse.urljoin(r.url, line))
+
+    logger.info(f"Downloading {len(segment_urls)} HLS segments")
+    result = io.BytesIO()
+    with tqdm(
+        total=len(segment_urls),
+        disable=bool(kwargs.get("hide_progress")),
+        unit="segment",
+    ) as progress:
+        # map keeps the segments in playlist order
+        for segment in get_hls_segment_executor().map(_get_hls_segment, segment_urls):
+            result.write(segment)
+            progress.update(1)
+
+    result.seek(0)
+    return result
+
+
 def download_hls(
     client: SoundCloud,
     track: Union[BasicTrack, Track],
     title: str,
+    dest_dir: pathlib.Path,
     kwargs: SCDLArgs,
     playlist_info: Optional[PlaylistInfo] = None,
 ) -> Tuple[str, bool]:
@@ -977,27 +1373,33 @@ def download_hls(
             f"{[t.preset for t in track.media.transcodings if t.format.protocol == 'hls']}",
         )
 
-    filename = get_filename(track, kwargs, ext=ext, playlist_info=playlist_info)
+    filename = str(dest_dir / get_filename(track, kwargs, ext=ext, playlist_info=playlist_info))
     logger.debug(f"filename : {filename}")
-    # Skip if file ID or filename already exists
-    if not to_stdout and already_downloaded(track, title, filename, kwargs):
-        return filename, True
-
-    # Get the requests stream
-    url = get_transcoding_m3u8(client, transcoding, kwargs)
-    _, ext = os.path.splitext(filename)
+    with get_output_lock(filename, to_stdout):
+        # Skip if file ID or filename already exists
+        if not to_stdout and already_downloaded(track, title, filename, kwargs):
+            return filename, True
 
-    re_encode_to_out(
-        track,
-        url,
-        preset_name
-        if preset_name != "aac"
-        else "ipod",  # We are encoding aac files to m4a, so an ipod codec is used
-        True,  # no need to fully re-encode the whole hls stream
-        filename,
-        kwargs,
-        playlist_info,
-    )
+        # Get the requests stream
+        try:
+            url = get_transcoding_m3u8(client, transcoding, kwargs)
+            hls_data = download_hls_segments(url, kwargs)
+        except requests.RequestException as err:
+            # Network errors left after retrying only fail this track
+            raise SoundCloudException(f"Unable to download HLS stream: {err}") from err
+        _, ext = os.path.splitext(filename)
+
+        re_encode_to_out(
+            track,
+            hls_data or url,
+            preset_name
+            if preset_name != "aac"
+            else "ipod",  # We are encoding aac files to m4a, so an ipod codec is used
+            True,  # no need to fully re-encode the whole hls stream
+            filename,
+            kwargs,
+            playlist_info,
+        )
 
     return filename, False
 
@@ -1005,6 +1407,7 @@ def download_hls(
 def download_track(
     client: SoundCloud,
     track: Union[BasicTrack, Track],
+    dest_dir: pathlib.Path,
     kwargs: SCDLArgs,
     playlist_info: Optional[PlaylistInfo] = None,
     exit_on_fail: bool = True,
@@ -1012,7 +1415,6 @@ def download_track(
     """Downloads a track"""
     try:
         title = track.title
-        title = title.encode("utf-8", "ignore").decode("utf-8")
         logger.info(f"Downloading {title}")
 
         # Not streamable
@@ -1027,7 +1429,7 @@ def download_track(
         me = client.get_me() if kwargs["auth_token"] else None
         client_user_id = me and me.id
 
-        lock = get_filelock(pathlib.Path(f"./{track.id}"), 0)
+        lock = get_filelock(dest_dir / str(track.id), 0)
 
         # Downloadable track
         filename = None
@@ -1044,6 +1446,7 @@ def download_track(
                         client,
                         track,
                         title,
+                        dest_dir,
                         kwargs,
                         playlist_info,
                     )
@@ -1063,6 +1466,7 @@ def download_track(
                         client,
                         track,
                         title,
+                        dest_dir,
                         kwargs,
                         playlist_info,
                     )
@@ -1071,7 +1475,8 @@ def download_track(
                 return
 
         if kwargs.get("remove"):
-            files_to_keep.append(filename)
+            with files_to_keep_lock:
+                files_to_keep.add(filename)
 
         record_download_archive(track, kwargs)
         if kwargs["add_description"]:
@@ -1081,7 +1486,9 @@ def download_track(
 
         # Skip if file ID or filename already exists
         if is_already_downloaded and not kwargs.get("force_metadata"):
-            raise SoundCloudException(f"{filename} already downloaded.")
+            # Archived tracks are skipped without knowing their exact file name
+            name = filename if os.path.isfile(filename) else f'Track "{title}"'
+            raise SoundCloudException(f"{name} already downloaded.")
 
         # If file does not exist an error occurred
         # If we are downloading to stdout and reached this point, then most likely
@@ -1094,7 +1501,7 @@ def download_track(
             with open(filename, "rb") as f:
                 file_data = io.BytesIO(f.read())
 
-            _add_metadata_to_stream(track, file_data, kwargs, playlist_info)
+            _add_metadata_to_stream(track, file_data, kwargs, playlist_info, reuse_artwork=True)
 
             with open(filename, "wb") as f:
                 file_data.seek(0)
@@ -1113,8 +1520,7 @@ def download_track(
 
 
 def can_convert(filename: str) -> bool:
-    ext = os.path.splitext(filename)[1]
-    return "wav" in ext or "aif" in ext
+    return os.path.splitext(filename)[1].lower() in CONVERTIBLE_EXTENSIONS
 
 
 def create_description_file(description: Optional[str], filename: str) -> None:
@@ -1141,15 +1547,17 @@ def already_downloaded(
 ) -> bool:
     """Returns True if the file has already been downloaded"""
     already_downloaded = False
+    converting_to_flac = bool(kwargs.get("flac")) and can_convert(filename)
+    is_file = os.path.isfile(filename)
 
-    if os.path.isfile(filename):
+    if is_file:
         already_downloaded = True
-    if kwargs.get("flac") and can_convert(filename) and os.path.isfile(filename[:-4] + ".flac"):
+    if converting_to_flac and os.path.isfile(os.path.splitext(filename)[0] + ".flac"):
         already_downloaded = True
     if kwargs.get("download_archive") and in_download_archive(track, kwargs):
         already_downloaded = True
 
-    if kwargs.get("flac") and can_convert(filename) and os.path.isfile(filename):
+    if converting_to_flac and is_file:
         already_downloaded = False
 
     if kwargs.get("overwrite"):
@@ -1164,24 +1572,55 @@ def already_downloaded(
     return False
 
 
-def in_download_archive(track: Union[BasicTrack, Track], kwargs: SCDLArgs) -> bool:
-    """Returns True if a track_id exists in the download archive"""
-    archive_filename = kwargs.get("download_archive")
-    if not archive_filename:
-        return False
+def load_download_archive(archive_filename: Union[pathlib.Path, str]) -> Set[str]:
+    """Returns the track ids in the download archive"""
+    archive_path = pathlib.Path(archive_filename)
+    if not archive_path.exists():
+        return set()
 
     try:
-        with get_filelock(archive_filename), open(archive_filename, "a+", encoding="utf-8") as file:
-            file.seek(0)
-            track_id = str(track.id)
-            for line in file:
-                if line.strip() == track_id:
-                    return True
+        with get_filelock(archive_path), open(archive_path, encoding="utf-8") as file:
+            return {line.strip() for line in file if line.strip()}
     except OSError as ioe:
         logger.error("Error trying to read download archive...")
         logger.error(ioe)
 
-    return False
+    return set()
+
+
+def in_download_archive(track: Union[BasicTrack, Track], kwargs: SCDLArgs) -> bool:
+    """Returns True if a track_id exists in the download archive"""
+    archive_ids = kwargs.get("download_archive_ids")
+    if archive_ids is None:
+        return False
+    return str(track.id) in archive_ids
+
+
+def flush_download_archive(archive_filename: Union[pathlib.Path, str]) -> None:
+    """Write the pending track_ids to the download archive"""
+    with download_archive_lock:
+        lines = pending_download_archive_lines.pop(str(archive_filename), None)
+        if not lines:
+            return
+
+        try:
+            with get_filelock(archive_filename), open(
+                archive_filename,
+                "a",
+                encoding="utf-8",
+            ) as file:
+                file.write("".join(lines))
+        except OSError as ioe:
+            logger.error("Error trying to write to download archive...")
+            logger.error(ioe)
+
+
+def flush_download_archives() -> None:
+    for archive_filename in list(pending_download_archive_lines):
+        flush_download_archive(archive_filename)
+
+
+atexit.register(flush_download_archives)
 
 
 def record_download_archive(track: Union[BasicTrack, Track], kwargs: SCDLArgs) -> None:
@@ -1190,19 +1629,30 @@ def record_download_archive(track: Union[BasicTrack, Track], kwargs: SCDLArgs) -
     if not archive_filename:
         return
 
-    try:
-        with get_filelock(archive_filename), open(archive_filename, "a", encoding="utf-8") as file:
-            file.write(f"{track.id}\n")
-    except OSError as ioe:
-        logger.error("Error trying to write to download archive...")
-        logger.error(ioe)
+    archive_ids = kwargs.get("download_archive_ids")
+    if archive_ids is not None:
+        if str(track.id) in archive_ids:
+            return
+        archive_ids.add(str(track.id))
+
+    # Track ids are written in batches, see flush_download_archive
+    with download_archive_lock:
+        lines = pending_download_archive_lines.setdefault(str(archive_filename), [])
+        lines.append(f"{track.id}\n")
+        should_flush = len(lines) >= DOWNLOAD_ARCHIVE_FLUSH_INTERVAL
+    if should_flush:
+        flush_download_archive(archive_filename)
 
 
 def _try_get_artwork(url: str, size: str = "original") -> Optional[requests.Response]:
     new_artwork_url = url.replace("large", size)
 
     try:
-        artwork_response = requests.get(new_artwork_url, allow_redirects=False, timeout=5)
+        artwork_response = get_requests_session().get(
+            new_artwork_url,
+            allow_redirects=False,
+            timeout=5,
+        )
 
         if artwork_response.status_code != 200:
             return None
@@ -1216,6 +1666,14 @@ def _try_get_artwork(url: str, size: str = "original") -> Optional[requests.Resp
         return None
 
 
+def _get_artwork_mime_type(artwork_response: requests.Response) -> str:
+    content_type = artwork_response.headers.get("Content-Type", "").lower()
+    if content_type == PNG_MIME_TYPE:
+        return PNG_MIME_TYPE
+    # "image/jpg" is not a registered mime type
+    return JPEG_MIME_TYPE
+
+
 def build_ffmpeg_encoding_args(
     input_file: str,
     output_file: str,
@@ -1258,6 +1716,11 @@ def build_ffmpeg_encoding_args(
     return ffmpeg_args
 
 
+def _write_buffer_to_pipe(buffer: io.BytesIO, pipe: IO[bytes]) -> None:
+    pipe.write(buffer.getbuffer())
+    pipe.close()
+
+
 def _write_streaming_response_to_pipe(
     response: requests.Response,
     pipe: Union[IO[bytes], io.BytesIO],
@@ -1273,24 +1736,17 @@ def _write_streaming_response_to_pipe(
 
     logger.info("Receiving the streaming response")
     received = 0
-    chunk_size = 8192
-
-    with memoryview(bytearray(chunk_size)) as buffer:
-        for chunk in tqdm(
-            iter(lambda: response.raw.read(chunk_size), b""),
-            total=(total_length / chunk_size) + 1,
-            disable=bool(kwargs.get("hide_progress")),
-            unit="Kb",
-            unit_scale=chunk_size / 1024,
-        ):
-            if not chunk:
-                break
-
-            buffer_view = buffer[: len(chunk)]
-            buffer_view[:] = chunk
-
-            received += len(chunk)
-            pipe.write(buffer_view)
+    chunk_size = DOWNLOAD_CHUNK_SIZE
+
+    for chunk in tqdm(
+        iter(lambda: response.raw.read(chunk_size), b""),
+        total=(total_length // chunk_size) + 1,
+        disable=bool(kwargs.get("hide_progress")),
+        unit="Kb",
+        unit_scale=chunk_size / 1024,
+    ):
+        received += len(chunk)
+        pipe.write(chunk)
 
     pipe.flush()
 
@@ -1307,28 +1763,36 @@ def _add_metadata_to_stream(
     stream: io.BytesIO,
     kwargs: SCDLArgs,
     playlist_info: Optional[PlaylistInfo] = None,
+    reuse_artwork: bool = False,
 ) -> None:
     logger.info("Applying metadata...")
 
-    artwork_base_url = track.artwork_url or track.user.avatar_url
-    artwork_response = None
+    mutagen_file = mutagen.File(stream)
+
+    artwork: Optional[Tuple[bytes, str]] = None
+    if reuse_artwork and not kwargs.get("original_art"):
+        # Keep the artwork that is already embedded instead of downloading it again
+        artwork = extract_artwork(mutagen_file)
+
+    if artwork is None:
+        artwork_base_url = track.artwork_url or track.user.avatar_url
+        artwork_response = None
+
+        if kwargs.get("original_art"):
+            artwork_response = _try_get_artwork(artwork_base_url, "original")
 
-    if kwargs.get("original_art"):
-        artwork_response = _try_get_artwork(artwork_base_url, "original")
+        if artwork_response is None:
+            artwork_response = _try_get_artwork(artwork_base_url, "t500x500")
 
-    if artwork_response is None:
-        artwork_response = _try_get_artwork(artwork_base_url, "t500x500")
+        if artwork_response is not None:
+            artwork = artwork_response.content, _get_artwork_mime_type(artwork_response)
 
     artist: str = track.user.username
     if bool(kwargs.get("extract_artist")):
-        for dash in (" - ", " − ", " – ", " — ", " ― "):  # noqa: RUF001
-            if dash not in track.title:
-                continue
-
-            artist_title = track.title.split(dash, maxsplit=1)
-            artist = artist_title[0].strip()
-            track.title = artist_title[1].strip()
-            break
+        dash = DASH_RE.search(track.title)
+        if dash is not None:
+            artist = track.title[: dash.start()].strip()
+            track.title = track.title[dash.end() :].strip()
 
     album_available: bool = (playlist_info is not None) and not kwargs.get("no_album_tag")
 
@@ -1337,7 +1801,8 @@ def _add_metadata_to_stream(
         title=track.title,
         description=track.description,
         genre=track.genre,
-        artwork_jpeg=artwork_response.content if artwork_response else None,
+        artwork=artwork[0] if artwork else None,
+        artwork_mime_type=artwork[1] if artwork else JPEG_MIME_TYPE,
         link=track.permalink_url,
         date=track.created_at.strftime("%Y-%m-%d %H:%M:%S"),
         album_title=playlist_info["title"] if album_available else None,  # type: ignore[index]
@@ -1346,13 +1811,11 @@ def _add_metadata_to_stream(
         album_total_track_num=playlist_info["tracknumber_total"] if album_available else None,  # type: ignore[index]
     )
 
-    mutagen_file = mutagen.File(stream)
-
     try:
-        # Delete all the existing tags and write our own tags
-        if mutagen_file is not None:
-            stream.seek(0)
-            mutagen_file.delete(stream)
+        # Replace all the existing tags with our own tags. The tags are cleared in
+        # memory so that the stream is only rewritten once, by save()
+        if mutagen_file is not None and mutagen_file.tags is not None:
+            mutagen_file.tags.clear()
         assemble_metadata(mutagen_file, metadata)
     except NotImplementedError:
         logger.error(
@@ -1377,7 +1840,7 @@ def _add_metadata_to_stream(
 
 def re_encode_to_out(
     track: Union[BasicTrack, Track],
-    in_data: Union[requests.Response, str],
+    in_data: Union[requests.Response, str, io.BytesIO],
     out_codec: str,
     should_copy: bool,
     filename: str,
@@ -1399,7 +1862,7 @@ def re_encode_to_out(
 
     # see https://github.com/python/mypy/issues/5512
     with get_stdout() if to_stdout else open(filename, "wb") as out_handle:  # type: ignore[attr-defined]
-        shutil.copyfileobj(encoded, out_handle)
+        out_handle.write(encoded.getbuffer())
 
 
 def _is_ffmpeg_progress_line(parameters: List[str]) -> bool:
@@ -1417,7 +1880,7 @@ def _is_ffmpeg_progress_line(parameters: List[str]) -> bool:
 
 
 def _get_ffmpeg_pipe(
-    in_data: Union[requests.Response, str],  # streaming response or url
+    in_data: Union[requests.Response, str, io.BytesIO],  # streaming response, url or data
     out_codec: str,
     should_copy: bool,
     output_file: str,
@@ -1455,7 +1918,7 @@ def _is_unsupported_codec_for_streaming(codec: str) -> bool:
 
 
 def _re_encode_ffmpeg(
-    in_data: Union[requests.Response, str],  # streaming response or url
+    in_data: Union[requests.Response, str, io.BytesIO],  # streaming response, url or data
     out_file_name: str,
     out_codec: str,
     track_duration_ms: int,
@@ -1494,6 +1957,13 @@ def _re_encode_ffmpeg(
             args=(in_data, pipe.stdin, kwargs),
             daemon=True,
         )
+    elif isinstance(in_data, io.BytesIO):
+        assert pipe.stdin is not None
+        stdin_thread = threading.Thread(
+            target=_write_buffer_to_pipe,
+            args=(in_data, pipe.stdin),
+            daemon=True,
+        )
 
     # Start the threads
     if stdout_thread:
@@ -1539,10 +2009,10 @@ def _re_encode_ffmpeg(
     if pipe.returncode != 0:
         raise FFmpegError(pipe.returncode, errors_output)
 
-    # Read from the temp file, if needed
+    # Read from the temp file, if needed. Formats like flac are written to a file
+    # because ffmpeg seeks back to the header once the whole stream is encoded
     if out_file_name != "pipe:1":
-        with open(out_file_name, "rb") as f:
-            shutil.copyfileobj(f, stdout)
+        stdout = io.BytesIO(pathlib.Path(out_file_name).read_bytes())
 
     stdout.seek(0)
     return stdout
@@ -1560,7 +2030,7 @@ def _copy_stream(
 
 def re_encode_to_buffer(
     track: Union[BasicTrack, Track],
-    in_data: Union[requests.Response, str],  # streaming response or url
+    in_data: Union[requests.Response, str, io.BytesIO],  # streaming response, url or data
     out_codec: str,
     should_copy: bool,
     kwargs: SCDLArgs,
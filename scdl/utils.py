@@ -12,6 +12,8 @@ from termcolor import colored
 
 __all__ = ("ColorizeFilter",)
 
+SIZE_RE = re.compile(r"^\s*([0-9\.]+)\s*([kmgtp])?", re.IGNORECASE)
+
 
 class ColorizeFilter(logging.Filter):
     COLOR_BY_LEVEL = MappingProxyType(
@@ -59,7 +61,7 @@ def size_in_bytes(insize: str) -> int:
         "t": 1024**4,
         "p": 1024**5,
     }
-    match = re.search(r"^\s*([0-9\.]+)\s*([kmgtp])?", insize, re.IGNORECASE)
+    match = SIZE_RE.search(insize)
 
     if match is None:
         raise ValueError("match not found")
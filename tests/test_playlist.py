@@ -51,6 +51,40 @@ def test_playlist(tmp_path: Path) -> None:
     assert_track_playlist_2(tmp_path)
 
 
+def test_jobs(tmp_path: Path) -> None:
+    os.chdir(tmp_path)
+    r = call_scdl_with_auth(
+        "-l",
+        "https://soundcloud.com/one-thousand-and-one/sets/test-playlist/s-ZSLfNrbPoXR",
+        "--playlist-name-format",
+        "{playlist[tracknumber]}_{title}",
+        "--onlymp3",
+        "--jobs",
+        "2",
+    )
+    assert r.returncode == 0
+    assert_track_playlist_1(tmp_path)
+    assert_track_playlist_2(tmp_path)
+
+
+def test_jobs_same_name(tmp_path: Path) -> None:
+    os.chdir(tmp_path)
+    r = call_scdl_with_auth(
+        "-l",
+        "https://soundcloud.com/one-thousand-and-one/sets/test-playlist/s-ZSLfNrbPoXR",
+        "--playlist-name-format",
+        "track",
+        "--onlymp3",
+        "-c",
+        "--jobs",
+        "2",
+    )
+    assert r.returncode == 0
+    assert_track(tmp_path / "test playlist", "track.mp3", check_metadata=False)
+    assert len(list((tmp_path / "test playlist").iterdir())) == 1
+    assert "track.mp3 already downloaded" in r.stderr
+
+
 def test_n(tmp_path: Path) -> None:
     os.chdir(tmp_path)
     r = call_scdl_with_auth(
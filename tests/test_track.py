@@ -387,6 +387,34 @@ def test_download_archive(tmp_path: Path) -> None:
     assert "already exists" in r.stderr
 
 
+@pytest.mark.skipif(not os.getenv("AUTH_TOKEN"), reason="No auth token specified")
+def test_download_archive_original(tmp_path: Path) -> None:
+    os.chdir(tmp_path)
+    r = call_scdl_with_auth(
+        "-l",
+        "https://soundcloud.com/57v/original",
+        "--name-format",
+        "track",
+        "--download-archive=archive.txt",
+    )
+    assert r.returncode == 0
+    os.remove("track.wav")
+    r = call_scdl_with_auth(
+        "-l",
+        "https://soundcloud.com/57v/original",
+        "--name-format",
+        "track",
+        "--download-archive=archive.txt",
+        "-c",
+        "--debug",
+    )
+    assert r.returncode == 0
+    assert "not requesting the original file" in r.stderr
+    assert "filename : " not in r.stderr
+    assert 'Track "copy" already downloaded' in r.stderr
+    assert not os.path.exists("track.wav")
+
+
 def test_description_file(tmp_path: Path) -> None:
     os.chdir(tmp_path)
     r = call_scdl_with_auth(
@@ -402,3 +430,36 @@ def test_description_file(tmp_path: Path) -> None:
     assert desc_file.exists()
     with open(desc_file, encoding="utf-8") as f:
         assert f.read().splitlines() == ["test description:", "9439290883"]
+
+
+def test_stdin_urls(tmp_path: Path) -> None:
+    os.chdir(tmp_path)
+    urls = (
+        "https://soundcloud.com/one-thousand-and-one/test-track\n"
+        "\n"
+        "https://soundcloud.com/one-thousand-and-one/test-track-2/s-fgLQFAzNIMP\n"
+    )
+    r = call_scdl_with_auth(
+        "--stdin-urls",
+        "--name-format",
+        "{title}",
+        "--onlymp3",
+        "-c",
+        input=urls,
+    )
+    assert r.returncode == 0
+    assert_track(tmp_path, "testing - test track.mp3")
+    assert_track(tmp_path, "test track 2.mp3", "test track 2")
+
+    # Already downloaded tracks must not prevent the next URLs from being processed
+    r = call_scdl_with_auth(
+        "--stdin-urls",
+        "--name-format",
+        "{title}",
+        "--onlymp3",
+        "-c",
+        input=urls,
+    )
+    assert r.returncode == 1
+    assert "testing - test track.mp3 already downloaded" in r.stderr
+    assert "test track 2.mp3 already downloaded" in r.stderr
@@ -12,11 +12,13 @@ client_id = SoundCloud().client_id
 def call_scdl_with_auth(
     *args: str,
     encoding: Optional[str] = "utf-8",
+    input: Optional[str] = None,
 ) -> subprocess.CompletedProcess:
     auth_token = os.getenv("AUTH_TOKEN", "")
     args = ("scdl", *args, f"--auth-token={auth_token}", f"--client-id={client_id}")
     return subprocess.run(
         args,
+        input=input,
         capture_output=True,
         encoding=encoding,
         errors="ignore" if encoding is not None else None,